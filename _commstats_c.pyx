@@ -0,0 +1,93 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""@package _commstats_c
+Compiled kernels for the communication statistics module.
+Build with: python3 setup.py build_ext --inplace
+This extension is optional. It is used by commstats before numba and NumPy.
+"""
+
+import numpy as np
+from libc.stdint cimport int64_t
+
+ctypedef fused real:
+    float
+    double
+
+
+def all_stats(const real[:, ::1] rows, Py_ssize_t first, const int64_t[::1] ks):
+    """
+    Computes all values required by the statistics for each line, in a single pass.
+
+    Same as commstats._all_stats_kernel: the lines received are the lines
+    first, first+1, ... of C, and each line is read from memory once.
+
+    Returns
+    -------
+    tuple
+        Sum, maximum, variance, communication with neighbors, radius r_i for CC,
+        and sums of the diagonal blocks of size k*k (one column per k) of
+        each line, and whether the lines have NaNs and negative values.
+    """
+    cdef Py_ssize_t num_rows = rows.shape[0]
+    cdef Py_ssize_t dim = rows.shape[1]
+    cdef Py_ssize_t num_ks = ks.shape[0]
+    row_sums_arr = np.empty(num_rows)
+    row_max_arr = np.empty(num_rows)
+    row_vars_arr = np.empty(num_rows)
+    neighbors_arr = np.zeros(num_rows)
+    radii_arr = np.empty(num_rows, dtype=np.int64)
+    split_arr = np.zeros((num_rows, num_ks))
+    cdef double[::1] row_sums = row_sums_arr
+    cdef double[::1] row_max = row_max_arr
+    cdef double[::1] row_vars = row_vars_arr
+    cdef double[::1] neighbors = neighbors_arr
+    cdef int64_t[::1] radii = radii_arr
+    cdef double[:, ::1] split = split_arr
+    cdef bint has_nan = False
+    cdef bint has_negative = False
+    cdef Py_ssize_t line, i, j, index, k, block, radius
+    cdef double value, accum, max_val, mean, sq_dev, half_cost, cost
+    with nogil:
+        for line in range(num_rows):
+            i = first + line
+            accum = 0.
+            max_val = rows[line, 0]
+            for j in range(dim):
+                value = rows[line, j]
+                if value != value:  # only NaNs are different from themselves
+                    has_nan = True
+                elif value < 0.:
+                    has_negative = True
+                accum += value
+                if value > max_val:
+                    max_val = value
+            row_sums[line] = accum
+            row_max[line] = max_val
+            # Variance with the mean already known
+            mean = accum/dim
+            sq_dev = 0.
+            for j in range(dim):
+                sq_dev += (rows[line, j] - mean)*(rows[line, j] - mean)
+            row_vars[line] = sq_dev/dim
+            if i > 0:
+                neighbors[line] += rows[line, i-1]
+            if i < dim-1:
+                neighbors[line] += rows[line, i+1]
+            # Expands the radius until half of the communication cost of the line is covered
+            half_cost = accum/2
+            radius = 0
+            cost = rows[line, i]
+            while cost < half_cost and radius < dim:
+                radius += 1
+                if i-radius >= 0:
+                    cost += rows[line, i-radius]
+                if i+radius < dim:
+                    cost += rows[line, i+radius]
+            radii[line] = radius
+            for index in range(num_ks):
+                k = ks[index]
+                block = i // k
+                if block < dim // k:
+                    for j in range(block*k, (block+1)*k):
+                        split[line, index] += rows[line, j]
+    return (row_sums_arr, row_max_arr, row_vars_arr, neighbors_arr, radii_arr, split_arr,
+            has_nan, has_negative)
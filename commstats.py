@@ -1,11 +1,33 @@
 # This code has been tested with Python 3 only
 # Python 2 could generate problems with the division using integers
+# functools.cached_property requires Python 3.8 or newer
 """@package commstats
 Communication statistics module.
 Please check the information on the CommunicationStatistics class for more details.
 """
 
+from functools import cached_property
+from typing import NamedTuple
 import numpy as np
+import pandas as pd
+# The kernels come from the compiled extension (see setup.py) or from numba;
+# both are optional, NumPy is used if neither is available
+try:
+    from _commstats_c import all_stats as _all_stats_c
+except ImportError:
+    _all_stats_c = None
+njit = None
+prange = range
+if _all_stats_c is None:    # numba is not imported if it is not needed
+    try:
+        from numba import njit, prange, get_num_threads, set_num_threads
+    except ImportError:
+        pass
+
+# Number of consecutive lines processed together by each thread
+CC_TILE_SIZE = 64
+# Approximate size in bytes of the lines read at a time when the matrix is streamed
+STREAM_CHUNK_BYTES = 64*2**20
 
 class CommunicationStatistics():
     """
@@ -15,16 +37,36 @@ class CommunicationStatistics():
     ----------
     csv_file : string
         Name of the CSV file containing the communication costs matrix.
+    dtype : data-type, optional
+        Data type used to store the matrix, np.float64 (default) or np.float32.
+        np.float32 halves the memory used by the matrix at the cost of precision.
+    stream : bool, optional
+        If True, the file is read about STREAM_CHUNK_BYTES at a time and only the
+        values required by the statistics are kept, instead of the whole matrix
+        (default = False).
+    split_ks : iterable of int, optional
+        Values of k for which the split fraction is computed while reading the
+        matrix (default = (2, 4, 8)). When the matrix is streamed, the split
+        fraction is only available for these values.
 
     Attributes
     ----------
-    costs : np.ndarray
-        Communication costs matrix.
+    costs : np.ndarray or None
+        Communication costs matrix, stored in C order (None if the matrix was streamed).
+    dim : int
+        Number of lines (and columns) of the matrix.
+    row_sums : np.ndarray
+        Sum of each line of the matrix.
+    total : np.float64
+        Sum of all elements of the matrix (computed on first use).
+    max_val : np.float64
+        Maximum value of the matrix (computed on first use).
 
     Raises
     ------
     ValueError
-        If the matrix contains NaNs, negative values, or if the matrix is not square.
+        If the matrix contains NaNs, non-numeric or negative values, if the matrix
+        is not square, or if any value of split_ks is smaller than 1.
     ZeroDivisionError
         If the matrix contains any rows with zeros only.
 
@@ -60,24 +102,169 @@ class CommunicationStatistics():
     Symposium on Cluster, Cloud and Grid Computing (CCGRID), pp. 523-532. IEEE, 2018.
     """
 
-    def __init__(self, csv_file):
-        self.costs = np.genfromtxt(csv_file, delimiter=',')
-        # Checking if the matrix has any NaNs
-        if np.isnan(self.costs).any():
-            print("* The communication matrix has NaN values.")
+    def __init__(self, csv_file, dtype=np.float64, stream=False, split_ks=(2, 4, 8)):
+        # The kernels are only compiled for these data types
+        if np.dtype(dtype) not in (np.float64, np.float32):
+            print("* The data type has to be np.float64 or np.float32.")
             raise ValueError
-        #
-        # Checking if there are any negative values
-        if np.min(self.costs) < 0.:
-            print("* The communication matrix contains negative values.")
+        split_ks = sorted(set(split_ks))
+        if split_ks and split_ks[0] <= 0:
+            print("* The value of k has to be greater than zero.")
             raise ValueError
+        if stream:
+            num_columns = self._read_stream(csv_file, dtype, split_ks)
+        else:
+            # pandas' C parser is much faster than np.genfromtxt
+            try:
+                costs = pd.read_csv(csv_file, header=None, sep=',', dtype=dtype,
+                                    engine='c').to_numpy()
+            except ValueError:
+                print("* The communication matrix has non-numeric values.")
+                raise ValueError
+            # pandas returns the values in Fortran order; each line of C has
+            # to be contiguous in memory for the reductions over its lines
+            self.costs = np.ascontiguousarray(costs, dtype=dtype)
+            self.dim, num_columns = self.costs.shape
+            if _fused_kernel is not None and self.dim <= num_columns:
+                # A single pass over C computes everything the statistics need
+                self._store([_reduce_rows(self.costs, 0, split_ks)])
+            else:
+                # The other values are computed on first use
+                self.row_sums = _validate(self.costs)
+                self._split_sums = {}
         #
         # Checking if the communication matrix is square
-        if self.costs.shape[0] != self.costs.shape[1]:
+        if self.dim != num_columns:
             print("* The communication matrix has to be a square.")
             raise ValueError
+        #
+        # Checking if there are any rows with zeros only
+        if (self.row_sums == 0.).any():
+            print("* The communication matrix has rows with zeros only.")
+            raise ZeroDivisionError
         # Besides these errors, we should be fine to continue
 
+    def _read_stream(self, csv_file, dtype, split_ks):
+        """
+        Reads the matrix a few lines at a time, keeping only what the statistics need.
+
+        Parameters
+        ----------
+        csv_file : string
+            Name of the CSV file containing the communication costs matrix.
+        dtype : data-type
+            Data type used to read the matrix.
+        split_ks : list of int
+            Values of k for which the split fraction will be available.
+
+        Returns
+        -------
+        int
+            Number of columns of the matrix.
+
+        Notes
+        -----
+        Sets costs to None and dim to the number of lines read.
+        Reading stops early if the matrix has more lines than columns.
+        """
+        self.costs = None
+        reduced = []        # values computed for each chunk
+        first = 0           # index of the first line of the current chunk
+        num_columns = 0
+        with pd.read_csv(csv_file, header=None, sep=',', dtype=dtype, engine='c',
+                         iterator=True) as reader:
+            num_lines = 1       # the first line gives the number of columns
+            while True:
+                # Only the parsing is checked here: the values are validated
+                # by _reduce_rows, which prints its own messages
+                try:
+                    chunk = reader.get_chunk(num_lines)
+                    rows = np.ascontiguousarray(chunk.to_numpy(), dtype=dtype)
+                except StopIteration:
+                    break
+                except (pd.errors.ParserError, ValueError):
+                    print("* The communication matrix has non-numeric values.")
+                    raise ValueError
+                num_rows, num_columns = rows.shape
+                if first + num_rows > num_columns:
+                    first += num_rows   # not square, no need to continue
+                    break
+                reduced.append(_reduce_rows(rows, first, split_ks))
+                first += num_rows
+                num_lines = _stream_chunk_lines(num_columns, rows.itemsize)
+        self.dim = first
+        self._store(reduced)
+        return num_columns
+
+    def _store(self, reduced):
+        """
+        Stores the values computed over groups of lines of the matrix.
+
+        Parameters
+        ----------
+        reduced : list of _ReducedRows
+            Values computed for consecutive groups of lines, in order.
+
+        Notes
+        -----
+        Fills T, max(C), the variance of each line, sum_i( C(i,i-1)+C(i,i+1) ),
+        the sum used by CC, and the sum of the blocks of size k*k in the
+        diagonal of C for each k in split_ks.
+        """
+        self.row_sums = np.concatenate([part.row_sums for part in reduced] or [np.zeros(0)])
+        self.max_val = max((part.max_val for part in reduced), default=0.)
+        self._row_vars = np.concatenate([part.row_vars for part in reduced] or [np.zeros(0)])
+        self._neighbor_sum = sum(part.neighbor_sum for part in reduced)
+        self._cc_sum = sum(part.cc_sum for part in reduced)
+        self._split_sums = {}
+        for part in reduced:
+            for k, accum in part.split_sums.items():
+                self._split_sums[k] = self._split_sums.get(k, 0.) + accum
+
+    @cached_property
+    def row_sums(self):
+        """Sum of each line of the matrix, T(i) = sum(C(i))."""
+        return np.sum(self.costs, axis=1)
+
+    @cached_property
+    def total(self):
+        """Sum of all elements of the matrix, sum(C)."""
+        return np.sum(self.row_sums)
+
+    @cached_property
+    def max_val(self):
+        """Maximum value of the matrix, max(C)."""
+        return np.max(self.costs)
+
+    @cached_property
+    def _row_vars(self):
+        """Variance of each line of the matrix, var(C(i))."""
+        return _row_variances(self.costs, self.row_sums)
+
+    @cached_property
+    def _ch_core(self):
+        """Communication heterogeneity without the scale factor, sum_i(var(C(i)))/max(C)^2/n."""
+        # var(a*X) = a^2*var(X), so the normalized matrix does not need to be computed;
+        # CH and CHv2 only differ by a factor of 100^2
+        return np.sum(self._row_vars)/self.max_val**2/self.dim
+
+    @cached_property
+    def _neighbor_sum(self):
+        """Communication between neighbors, sum_i( C(i,i-1)+C(i,i+1) )."""
+        # C(i,i-1) and C(i,i+1) are the sub- and super-diagonals of C,
+        # which already leave out the neighbors outside the matrix
+        return (np.sum(np.diagonal(self.costs, offset=-1)) +
+                np.sum(np.diagonal(self.costs, offset=1)))
+
+    @cached_property
+    def _cc_sum(self):
+        """Sum used by the communication centrality, sum_i( min(i+r_i,n-1) - max(i-r_i,0) )."""
+        # _cc_numpy creates about six temporaries of 64 bits per value of the lines it
+        # receives, so the lines are processed in blocks of about STREAM_CHUNK_BYTES in total
+        num_lines = max(1, STREAM_CHUNK_BYTES // (6*8*self.dim))
+        return sum(_cc_span_sum(_cc_numpy(self.costs[first:first+num_lines], first), first, self.dim)
+                   for first in range(0, self.dim, num_lines))
+
     def communication_heterogeneity(self):
         """
         Computes the communication heterogeneity (CH) of a matrix.
@@ -94,10 +281,7 @@ class CommunicationStatistics():
         It can also be seen as the sum of the variances for each row
         divided by n.
         """
-        dim = self.costs.shape[0]
-        norm_costs = 100.*self.costs/np.max(self.costs)   # normalize C
-        var_row = np.var(norm_costs, axis=1)      # variance pew row
-        stats = np.sum(var_row)/dim
+        stats = 100.**2*self._ch_core
         return stats
 
     def ch(self):   # pylint: disable=invalid-name
@@ -123,8 +307,8 @@ class CommunicationStatistics():
         -----
         CA = sum(C)/n^2
         """
-        dim = self.costs.shape[0]
-        stats = np.sum(self.costs)/(dim**2)
+        dim = self.dim
+        stats = self.total/(dim**2)
         return stats
 
     def ca(self):   # pylint: disable=invalid-name
@@ -151,9 +335,8 @@ class CommunicationStatistics():
         Given T(i) = sum(C(i)),
         CB = (max(T)/(sum_i(T(i))/n) - 1)*100
         """
-        dim = self.costs.shape[0]
-        row_sums = np.sum(self.costs, axis=1) # computes T
-        stats = (dim*np.max(row_sums)/np.sum(row_sums) - 1) * 100 # we move 'n' to simplify
+        dim = self.dim
+        stats = (dim*np.max(self.row_sums)/self.total - 1) * 100 # we move 'n' to simplify
         return stats
 
     def cb(self):   # pylint: disable=invalid-name
@@ -183,24 +366,7 @@ class CommunicationStatistics():
         r_i = argmin_r( sum_j[i-r..i+r]( C(i,j) ) >= sum(C(i))/2 ),
         CC = sum_i( min(i+r_i,n-1) - max(i-r_i,0) )/n^2
         """
-        dim = self.costs.shape[0]
-        accum_r = 0.        # value accumulated for each line of C
-        for i in range(0, dim):
-            row = self.costs[i]   # line of interest
-            half_cost = np.sum(row)/2
-            radius = 0
-            accum = row[i]    # starting value from where we expand
-            # Iterate over the line accumulating communication costs
-            # until we cover half of its communication cost
-            while accum < half_cost:
-                radius += 1
-                # Checks that we are not surpassing the limits of the row
-                if i-radius >= 0:
-                    accum += row[i-radius]
-                if i+radius < dim:
-                    accum += row[i+radius]
-            accum_r += min(i+radius, dim-1) - max(i-radius, 0)
-        stats = accum_r/(dim**2)
+        stats = self._cc_sum/(self.dim**2)
         return stats
 
     def cc(self):   # pylint: disable=invalid-name
@@ -227,12 +393,7 @@ class CommunicationStatistics():
         Consider, for simplicity, that C(i,j) = 0 if j<0 or j>=n.
         NBC = 1 - sum_i( C(i,i-1)+C(i,i+1) )/sum(C)
         """
-        accum = 0.
-        dim = self.costs.shape[0]
-        for i in range(1, dim-1): # Ignoring extremes (below 0, above n)
-            accum += self.costs[i, i-1] + self.costs[i, i+1]
-        accum += self.costs[0, 1] + self.costs[dim-1, dim-2] # Last extremes missing
-        stats = 1 - accum/np.sum(self.costs)
+        stats = 1 - self._neighbor_sum/self.total
         return stats
 
     def nbc(self):   # pylint: disable=invalid-name
@@ -269,19 +430,92 @@ class CommunicationStatistics():
         The split fraction is the amount of communication that is done
         around blocks of k * k processes.
         SP(k) = 1 - sum_s[..n/k-1]sum_l[0..k]sum_m[0..k]C(s*k+l,s*k+m)/sum(C)
+
+        See Also
+        --------
+        split_fractions : Computes the split fraction of a matrix for multiple values of k.
         """
-        accum = 0.
-        dim = self.costs.shape[0]
-        if k > 0.:
-            for s in range(0, int(dim/k)): # pylint: disable=invalid-name
-                # Adds the values of a sub-matrix with sides of size k
-                accum += np.sum(self.costs[s*k:(s+1)*k, s*k:(s+1)*k])
-        else:
+        return self.split_fractions([k])[k]
+
+    def split_fractions(self, ks):
+        """
+        Computes the split fraction (SP(k)) of a matrix for multiple values of k.
+
+        Parameters
+        ----------
+        ks : iterable of int
+            Sizes of the sub-matrices considered.
+
+        Returns
+        -------
+        dict
+            Split fraction value (np.float64) for each value of k.
+
+        Raises
+        ------
+        ValueError
+            If any value of k is smaller than 1, or if the matrix was streamed
+            and k was not in split_ks.
+
+        Notes
+        -----
+        sum(C) is shared with the other statistics, and the values of k given
+        as split_ks to the constructor were already computed.
+        The blocks of size k * k are unions of the blocks of size d * d for
+        any divisor d of k, so the block sums computed for a smaller k are
+        reused for its multiples instead of reading C again.
+        """
+        ks = sorted(set(ks))
+        if ks and ks[0] <= 0:
             print("* The value of k has to be greater than zero.")
             raise ValueError
-        stats = 1 - accum/np.sum(self.costs)
+        # Values of k in split_ks were computed while reading the matrix
+        stats = {k: 1 - self._split_sums[k]/self.total for k in ks if k in self._split_sums}
+        missing = [k for k in ks if k not in stats]
+        if missing and self.costs is None:
+            print("* The split fraction of a streamed matrix is only available for split_ks.")
+            raise ValueError
+        dim = self.dim
+        block_sums = {}     # block sums of C for each size of block computed
+        for k in missing:
+            divisors = [d for d in block_sums if k % d == 0]
+            if divisors:
+                base = max(divisors)
+            else:
+                base = k
+                block_sums[k] = self._block_sums(k)
+            step = k // base        # a block of size k has step*step blocks of size base
+            num_blocks = dim // k
+            blocks = block_sums[base][:num_blocks*step, :num_blocks*step]
+            blocks = blocks.reshape(num_blocks, step, num_blocks, step)
+            # Adds the values of the sub-matrices with sides of size k
+            accum = np.einsum('isit->', blocks)
+            stats[k] = 1 - accum/self.total
         return stats
 
+    def _block_sums(self, k):
+        """
+        Computes the sums of all sub-matrices with sides of size k of a matrix.
+
+        Parameters
+        ----------
+        k : int
+            Size of the sub-matrices considered.
+
+        Returns
+        -------
+        np.ndarray
+            Matrix of size (n/k)x(n/k) where the element (s,t) is the sum of
+            the sub-matrix of C starting at position (s*k,t*k).
+        """
+        dim = self.dim
+        num_blocks = dim // k
+        # Sums groups of k lines and then groups of k columns; the last
+        # (incomplete) group is computed only when n is not a multiple of k
+        starts = np.arange(0, dim, k)
+        blocks = np.add.reduceat(np.add.reduceat(self.costs, starts, axis=0), starts, axis=1)
+        return blocks[:num_blocks, :num_blocks]
+
     def sp(self, k: int = 2):   # pylint: disable=invalid-name
         """
         Short-hand for split_fraction.
@@ -308,10 +542,7 @@ class CommunicationStatistics():
         It can also be seen as the sum of the variances for each row
         divided by n.
         """
-        dim = self.costs.shape[0]
-        norm_costs = self.costs/np.max(self.costs)       # normalize C
-        var_row = np.var(norm_costs, axis=1)      # variance pew row
-        stats = np.sum(var_row)/dim
+        stats = self._ch_core
         return stats
 
     def ch_v2(self):   # pylint: disable=invalid-name
@@ -338,9 +569,8 @@ class CommunicationStatistics():
         Given T(i) = sum(C(i)),
         CB = 1 - (sum_i(T(i)/n)/max(T)
         """
-        dim = self.costs.shape[0]
-        row_sums = np.sum(self.costs, axis=1) # computes T
-        stats = 1 - np.sum(row_sums)/(dim*np.max(row_sums)) # we move 'n' to simplify
+        dim = self.dim
+        stats = 1 - self.total/(dim*np.max(self.row_sums)) # we move 'n' to simplify
         return stats
 
     def cb_v2(self):   # pylint: disable=invalid-name
@@ -352,3 +582,341 @@ class CommunicationStatistics():
         communication_balance_v2 : Computes the communication balance of a matrix.
         """
         return self.communication_balance_v2()
+
+
+def _stream_chunk_lines(num_columns, itemsize):
+    """
+    Computes the number of lines read at a time when the matrix is streamed.
+
+    Parameters
+    ----------
+    num_columns : int
+        Number of columns of the matrix.
+    itemsize : int
+        Size in bytes of each value of the matrix.
+
+    Returns
+    -------
+    int
+        Number of lines: a multiple of CC_TILE_SIZE times the number of threads
+        of the kernels (so every thread gets tiles to process), with about
+        STREAM_CHUNK_BYTES in total.
+    """
+    num_threads = get_num_threads() if njit is not None else 1
+    step = CC_TILE_SIZE*num_threads
+    num_lines = STREAM_CHUNK_BYTES // (num_columns*itemsize)
+    return max(step, num_lines // step * step)
+
+
+def set_kernel_threads(num_threads):
+    """
+    Sets the number of threads used by the numba kernels in this process.
+
+    Parameters
+    ----------
+    num_threads : int
+        Number of threads (at most numba's NUMBA_NUM_THREADS, the number of CPUs
+        by default).
+
+    Notes
+    -----
+    Processes computing statistics in parallel should use a single thread each,
+    otherwise each one of them starts one thread per CPU.
+    Does nothing if numba is not used.
+    """
+    if njit is not None:
+        set_num_threads(num_threads)
+
+
+def compile_kernels(dtypes=(np.float64,)):
+    """
+    Compiles the numba kernels used by CommunicationStatistics in advance.
+
+    Parameters
+    ----------
+    dtypes : list of data-type, optional
+        Data types of the matrices that will be processed (the dtype parameter of
+        CommunicationStatistics). The kernels are compiled separately for each one.
+
+    Notes
+    -----
+    The kernels are module-level functions compiled with cache=True, so they
+    are compiled once per process (or loaded from the cache on disk) and then
+    reused for every matrix. Calling this function before processing multiple
+    files moves this cost out of the processing of the first file.
+    The kernels run in parallel, so this function should not be called in a
+    process that later forks workers: call it in each worker instead.
+    Does nothing if numba is not used (not available, or replaced by the
+    compiled extension).
+    """
+    if njit is None:
+        return
+    for dtype in dtypes:
+        _all_stats_kernel(np.ones((2, 2), dtype=dtype), 0, np.array([2], dtype=np.int64))
+
+
+class _ReducedRows(NamedTuple):
+    """Values computed over a group of consecutive lines of the matrix."""
+    row_sums: np.ndarray    # sum of each line
+    max_val: float          # maximum value of the lines
+    row_vars: np.ndarray    # variance of each line
+    neighbor_sum: float     # sum_i( C(i,i-1)+C(i,i+1) ) over the lines
+    cc_sum: int             # sum_i( min(i+r_i,n-1) - max(i-r_i,0) ) over the lines
+    split_sums: dict        # sum of the diagonal blocks of size k*k in the lines, per k
+
+
+def _reduce_rows(rows, first, ks):
+    """
+    Computes all values required by the statistics over a group of lines.
+
+    Parameters
+    ----------
+    rows : np.ndarray
+        Lines first, first+1, ... of the communication matrix (in C order).
+    first : int
+        Index of the first line received.
+    ks : list of int
+        Values of k for which the split fraction is computed.
+
+    Returns
+    -------
+    _ReducedRows
+        Values computed over the lines.
+
+    Raises
+    ------
+    ValueError
+        If the lines contain NaNs or negative values.
+    """
+    num_rows, dim = rows.shape
+    if _fused_kernel is not None:
+        # Single pass over the lines
+        (row_sums, row_max, row_vars, neighbors, radii, split,
+         has_nan, has_negative) = _fused_kernel(rows, first, np.array(ks, dtype=np.int64))
+        _check(has_nan, has_negative)
+        return _ReducedRows(row_sums, np.max(row_max), row_vars, np.sum(neighbors),
+                            _cc_span_sum(radii, first, dim),
+                            dict(zip(ks, np.sum(split, axis=0))))
+    row_sums = _validate(rows)
+    local = np.arange(num_rows)
+    lines = first + local
+    # C(i,i-1) for i>0 and C(i,i+1) for i<n-1
+    has_low = lines > 0
+    has_high = lines < dim-1
+    neighbor_sum = (np.sum(rows[local[has_low], lines[has_low]-1]) +
+                    np.sum(rows[local[has_high], lines[has_high]+1]))
+    split_sums = {}
+    for k in ks:
+        # Sums of groups of k columns; line i has its diagonal block in group i/k
+        starts = np.arange(0, dim, k)
+        row_blocks = np.add.reduceat(rows, starts, axis=1)
+        in_block = lines < (dim//k)*k
+        split_sums[k] = np.sum(row_blocks[local[in_block], lines[in_block]//k])
+    return _ReducedRows(row_sums, np.max(rows), _row_variances(rows, row_sums), neighbor_sum,
+                        _cc_span_sum(_cc_numpy(rows, first), first, dim), split_sums)
+
+
+def _check(has_nan, has_negative):
+    """
+    Raises an error if the matrix has NaNs or negative values.
+
+    Raises
+    ------
+    ValueError
+        If the matrix contains NaNs or negative values.
+    """
+    # Checking if the matrix has any NaNs
+    if has_nan:
+        print("* The communication matrix has NaN values.")
+        raise ValueError
+    #
+    # Checking if there are any negative values
+    if has_negative:
+        print("* The communication matrix contains negative values.")
+        raise ValueError
+
+
+def _validate(rows):
+    """
+    Computes the sum of each line and checks for NaNs and negative values.
+
+    Parameters
+    ----------
+    rows : np.ndarray
+        Lines of the communication matrix.
+
+    Returns
+    -------
+    np.ndarray
+        Sum of each line.
+
+    Raises
+    ------
+    ValueError
+        If the lines contain NaNs or negative values.
+    """
+    row_sums = np.sum(rows, axis=1)
+    # NaNs propagate to the sums
+    _check(np.isnan(row_sums).any(), np.min(rows) < 0.)
+    return row_sums
+
+
+def _row_variances(rows, row_sums):
+    """
+    Computes the variance of each line of the matrix.
+
+    Parameters
+    ----------
+    rows : np.ndarray
+        Lines of the communication matrix.
+    row_sums : np.ndarray
+        Sum of each line.
+
+    Returns
+    -------
+    np.ndarray
+        Variance of each line.
+
+    Notes
+    -----
+    var(X) = E[X^2] - E[X]^2 is computed from the sums of squares of the
+    lines (a single pass over C, without temporary matrices) and the sums
+    already known. This formula loses precision when the variance of a line
+    is very small compared to the square of its mean.
+    """
+    size = rows.shape[1]
+    sq_sums = np.einsum('ij,ij->i', rows, rows, dtype=np.float64)
+    # Rounding errors could make the difference slightly negative
+    return np.maximum(sq_sums/size - (row_sums/size)**2, 0.)
+
+
+def _cc_span_sum(radii, first, dim):
+    """
+    Computes sum_i( min(i+r_i,n-1) - max(i-r_i,0) ) for the communication centrality.
+
+    Parameters
+    ----------
+    radii : np.ndarray
+        Radius of the lines first, first+1, ... of the communication matrix.
+    first : int
+        Index of the first line.
+    dim : int
+        Number of columns of the communication matrix.
+
+    Returns
+    -------
+    int
+        Sum of the spans of the lines.
+    """
+    # np.minimum/np.maximum replace the two comparisons per line of a Python loop
+    lines = first + np.arange(len(radii))
+    return np.sum(np.minimum(lines+radii, dim-1) - np.maximum(lines-radii, 0))
+
+
+def _all_stats_kernel(rows, first, ks):
+    """
+    Computes all values required by the statistics for each line, in a single pass.
+
+    The lines received are the lines first, first+1, ... of C.
+    Compiled with numba when it is available. The lines are split in tiles of
+    CC_TILE_SIZE consecutive lines among the threads. Each line is read from
+    memory once: the passes after the first one (variance, radius for CC, and
+    blocks for SP) find it in cache.
+
+    Returns
+    -------
+    tuple
+        Sum, maximum, variance, communication with neighbors, radius r_i for CC,
+        and sums of the diagonal blocks of size k*k (one column per k) of
+        each line, and whether the lines have NaNs and negative values.
+    """
+    num_rows, dim = rows.shape
+    num_ks = ks.shape[0]
+    row_sums = np.empty(num_rows)
+    row_max = np.empty(num_rows)
+    row_vars = np.empty(num_rows)
+    neighbors = np.zeros(num_rows)
+    radii = np.empty(num_rows, dtype=np.int64)
+    split = np.zeros((num_rows, num_ks))
+    nan_rows = np.zeros(num_rows, dtype=np.bool_)
+    negative_rows = np.zeros(num_rows, dtype=np.bool_)
+    num_tiles = (num_rows + CC_TILE_SIZE - 1) // CC_TILE_SIZE
+    for tile in prange(num_tiles):   # pylint: disable=not-an-iterable
+        for line in range(tile*CC_TILE_SIZE, min((tile+1)*CC_TILE_SIZE, num_rows)):
+            row = rows[line]
+            i = first + line
+            accum = 0.
+            max_val = row[0]
+            for j in range(dim):
+                value = row[j]
+                if value != value:  # only NaNs are different from themselves
+                    nan_rows[line] = True
+                elif value < 0.:
+                    negative_rows[line] = True
+                accum += value
+                max_val = max(max_val, value)
+            row_sums[line] = accum
+            row_max[line] = max_val
+            # Variance with the mean already known
+            mean = accum/dim
+            sq_dev = 0.
+            for j in range(dim):
+                sq_dev += (row[j] - mean)**2
+            row_vars[line] = sq_dev/dim
+            if i > 0:
+                neighbors[line] += row[i-1]
+            if i < dim-1:
+                neighbors[line] += row[i+1]
+            # Expands the radius until half of the communication cost of the line is covered
+            half_cost = accum/2
+            radius = 0
+            cost = row[i]
+            while cost < half_cost and radius < dim:
+                radius += 1
+                if i-radius >= 0:
+                    cost += row[i-radius]
+                if i+radius < dim:
+                    cost += row[i+radius]
+            radii[line] = radius
+            for index in range(num_ks):
+                k = ks[index]
+                block = i // k
+                if block < dim // k:
+                    for j in range(block*k, (block+1)*k):
+                        split[line, index] += row[j]
+    return (row_sums, row_max, row_vars, neighbors, radii, split,
+            nan_rows.any(), negative_rows.any())
+
+
+if njit is not None:
+    _all_stats_kernel = njit(parallel=True, cache=True)(_all_stats_kernel)
+
+# Kernel used to compute the statistics in a single pass (None: NumPy is used)
+if _all_stats_c is not None:
+    _fused_kernel = _all_stats_c
+elif njit is not None:
+    _fused_kernel = _all_stats_kernel
+else:
+    _fused_kernel = None
+
+
+def _cc_numpy(rows, first):
+    """
+    Computes the radius r_i of each line for the communication centrality.
+
+    The lines received are the lines first, first+1, ... of C.
+    Vectorized version used when numba is not available.
+    """
+    num_rows, dim = rows.shape
+    # P(i,j) = sum_l[0..j-1]C(i,l): prefix sums per line, with a leading zero
+    prefix = np.concatenate((np.zeros((num_rows, 1)), np.cumsum(rows, axis=1)), axis=1)
+    half_cost = prefix[:, -1:]/2
+    # Bounds of the interval [i-r..i+r] for every line i and radius r
+    lines = first + np.arange(num_rows)[:, np.newaxis]
+    radii = np.arange(dim)[np.newaxis, :]
+    low = np.maximum(lines - radii, 0)
+    high = np.minimum(lines + radii, dim-1)
+    # S_i(r) = sum_j[i-r..i+r]( C(i,j) ) = P(i,i+r+1) - P(i,i-r)
+    accum = np.take_along_axis(prefix, high+1, axis=1) - np.take_along_axis(prefix, low, axis=1)
+    # S_i is non-decreasing in r, so r_i is the number of radii below half the cost
+    return np.sum(accum < half_cost, axis=1)
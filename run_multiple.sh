@@ -25,6 +25,7 @@ def main():
         # row[0]: file
         # row[1]: application name
         stats = CommunicationStatistics(row[0])
+        split = stats.split_fractions([4, 16])
         # computes all stats and adds as a row in the output DataFrame
         output_df = output_df.append({
             'Application': row[1],
@@ -35,8 +36,8 @@ def main():
             'CBv2': stats.cb_v2(),
             'CC': stats.cc(),
             'NBC': stats.nbc(),
-            'SP(4)': stats.sp(4),
-            'SP(16)': stats.sp(16),
+            'SP(4)': split[4],
+            'SP(16)': split[16],
         }, ignore_index=True)
     # Saves output DataFrame as a CSV file
     output_df.to_csv(sys.argv[2], sep=',', index=False)
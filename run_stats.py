@@ -5,28 +5,64 @@ Prints all statistics for a given CSV file or for a list of CSV files
 Usage:
 - python3 run_stats.py csvfile.csv [and other files]
 - ./run_stats.py csvfile.csv [and other files]
+- ./run_stats.py -j 4 csvfile.csv [and other files] (uses 4 processes; default: number of CPUs;
+  with more than one process, each one uses a single thread)
 - for computing statistics for all files in a directory: find DIR_NAME/* -exec ./run_stats.py {} +
+  (use '{} +' instead of '{} \\;' so that all files are processed by a single call:
+  the numba kernels are then compiled only once for all files)
 """
 
-import sys
-from commstats import CommunicationStatistics
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from commstats import CommunicationStatistics, compile_kernels, set_kernel_threads
+
+def _process_one(path):
+    """Computes several communication statistics over a file and returns them as text"""
+    stats = CommunicationStatistics(path)
+    split = stats.split_fractions([2, 4, 8])
+    lines = [
+        '*** Communication statistics for ' + path + ' ***',
+        'Communication heterogeneity (CH):\t ' + str(stats.ch()),
+        'Communication heterogeneity v2 (CH):\t ' + str(stats.ch_v2()),
+        'Communication amount (CA):\t ' + str(stats.ca()),
+        'Communication balance (CB):\t ' + str(stats.cb()),
+        'Communication balance v2 (CB):\t ' + str(stats.cb_v2()),
+        'Communication centrality (CC):\t ' + str(stats.cc()),
+        'Neighbor communication factor (NBC):\t ' + str(stats.nbc()),
+        'Split fraction SP(k), k=2:\t ' + str(split[2]),
+        'Split fraction SP(k), k=4:\t ' + str(split[4]),
+        'Split fraction SP(k), k=8:\t ' + str(split[8]),
+    ]
+    return '\n'.join(lines) + '\n'
+
+def _init_worker():
+    """Prepares a worker process: one thread for the kernels, which are compiled in advance"""
+    set_kernel_threads(1)
+    compile_kernels()
 
 def main():
     """Computes several communication statistics over a list of files"""
-    for arg in sys.argv[1:]:
-        print('*** Communication statistics for ' + arg + ' ***')
-        stats = CommunicationStatistics(arg)
-        print('Communication heterogeneity (CH):\t', stats.ch())
-        print('Communication heterogeneity v2 (CH):\t', stats.ch_v2())
-        print('Communication amount (CA):\t', stats.ca())
-        print('Communication balance (CB):\t', stats.cb())
-        print('Communication balance v2 (CB):\t', stats.cb_v2())
-        print('Communication centrality (CC):\t', stats.cc())
-        print('Neighbor communication factor (NBC):\t', stats.nbc())
-        print('Split fraction SP(k), k=2:\t', stats.sp(2))
-        print('Split fraction SP(k), k=4:\t', stats.sp(4))
-        print('Split fraction SP(k), k=8:\t', stats.sp(8))
-        print()
+    parser = argparse.ArgumentParser(description='Prints all communication statistics for CSV files.')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='number of files processed in parallel (default: number of CPUs); '
+                        'with more than one job, each file is processed by a single thread')
+    parser.add_argument('files', nargs='+', help='CSV files containing communication matrices')
+    args = parser.parse_args()
+    jobs = max(1, min(args.jobs, len(args.files)))
+    if jobs == 1:
+        compile_kernels()
+        for report in map(_process_one, args.files):
+            print(report)
+    else:
+        # Each worker compiles (or loads from the cache on disk) the kernels itself:
+        # numba's threading layer must not be started before the workers are forked.
+        # The workers use a single thread each to avoid oversubscribing the CPUs
+        # Results are printed in the same order as the files were given
+        chunksize = max(1, len(args.files)//(4*jobs))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            for report in executor.map(_process_one, args.files, chunksize=chunksize):
+                print(report)
 
 if __name__ == '__main__':
     main()
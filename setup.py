@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Builds the optional compiled kernels of the communication statistics module
+Usage:
+- python3 setup.py build_ext --inplace
+Requires Cython and a C compiler. Without the extension, commstats uses numba
+(if installed) or NumPy.
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+setup(
+    name='commstats',
+    py_modules=['commstats'],
+    ext_modules=cythonize([
+        Extension('_commstats_c', ['_commstats_c.pyx'], extra_compile_args=['-O3']),
+    ]),
+)
@@ -42,5 +42,16 @@ class AllOnesTest(unittest.TestCase):
     def test_sp8(self):
         self.assertEqual(self.stats.sp(8), 0.)
 
+    def test_split_fractions(self):
+        stats = self.stats.split_fractions([8, 2, 4])
+        self.assertEqual(sorted(stats), [2, 4, 8])
+        self.assertAlmostEqual(stats[2], 1.-8./14., places=10)
+        self.assertAlmostEqual(stats[4], 1.-12./14., places=10)
+        self.assertEqual(stats[8], 0.)
+
+class NeighborStreamTest(AllOnesTest):
+    def setUp(self):
+        self.stats = CommunicationStatistics('100_neighbor.csv', stream=True)
+
 if __name__ == '__main__':
     unittest.main()
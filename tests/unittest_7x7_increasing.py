@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Communication Statistics test with a 7x7 matrix with values 1 to 49,
+where the last diagonal block is incomplete for k=2,3,4 and there is no block for k=8
+"""
+
+import unittest
+import sys
+sys.path.insert(0, '..')
+from commstats import CommunicationStatistics
+
+class IncompleteBlocksTest(unittest.TestCase):
+    def setUp(self):
+        self.stats = CommunicationStatistics('7x7_increasing.csv')
+
+    # The sum of all values is 1225
+    def test_sp2(self):
+        self.assertAlmostEqual(self.stats.sp(2), 1.-252./1225., places=10)
+
+    def test_sp3(self):
+        self.assertAlmostEqual(self.stats.sp(3), 1.-378./1225., places=10)
+
+    def test_sp4(self):
+        self.assertAlmostEqual(self.stats.sp(4), 1.-208./1225., places=10)
+
+    def test_sp8(self):
+        self.assertEqual(self.stats.sp(8), 1.)
+
+    def test_split_fractions(self):
+        stats = self.stats.split_fractions([2, 4, 8])
+        self.assertEqual(sorted(stats), [2, 4, 8])
+        for k in stats:
+            self.assertAlmostEqual(stats[k], self.stats.sp(k), places=10)
+
+class IncompleteBlocksLazyTest(IncompleteBlocksTest):
+    # No split fraction is computed while reading: all of them come from split_fractions
+    def setUp(self):
+        self.stats = CommunicationStatistics('7x7_increasing.csv', split_ks=())
+
+class IncompleteBlocksStreamTest(IncompleteBlocksTest):
+    def setUp(self):
+        self.stats = CommunicationStatistics('7x7_increasing.csv', stream=True,
+                                             split_ks=(2, 3, 4, 8))
+
+if __name__ == '__main__':
+    unittest.main()
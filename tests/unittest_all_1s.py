@@ -42,5 +42,12 @@ class allOnesTest(unittest.TestCase):
     def test_sp8(self):
         self.assertEqual(self.stats.sp(8), 0.)
 
+    def test_split_fractions(self):
+        self.assertEqual(self.stats.split_fractions([2, 4, 8]), {2: 0.75, 4: 0.5, 8: 0.})
+
+class AllOnesStreamTest(allOnesTest):
+    def setUp(self):
+        self.stats = CommunicationStatistics('all_1s.csv', stream=True)
+
 if __name__ == '__main__':
     unittest.main()
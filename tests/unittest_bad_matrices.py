@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Communication Statistics test with matrices that should raise exceptions
+"""
+
+import io
+import unittest
+import sys
+import numpy as np
+from contextlib import redirect_stdout
+sys.path.insert(0, '..')
+from commstats import CommunicationStatistics
+
+class BadMatricesTest(unittest.TestCase):
+    stream = False
+
+    def assertRaisesMessage(self, exception, csv_file, message, **kwargs):
+        """Checks that reading the file raises the exception and prints only the message"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertRaises(exception, CommunicationStatistics, csv_file, stream=self.stream,
+                              **kwargs)
+        self.assertEqual(output.getvalue(), '* ' + message + '\n')
+
+    def test_nan_error(self):
+        self.assertRaisesMessage(ValueError, '../bad_matrices/nan_error.csv',
+                                 'The communication matrix has non-numeric values.')
+
+    def test_nan_values(self):
+        self.assertRaisesMessage(ValueError, '../bad_matrices/nan_values.csv',
+                                 'The communication matrix has NaN values.')
+
+    def test_negative_matrix(self):
+        self.assertRaisesMessage(ValueError, '../bad_matrices/negative_matrix.csv',
+                                 'The communication matrix contains negative values.')
+
+    def test_non_square(self):
+        self.assertRaisesMessage(ValueError, '../bad_matrices/non_square.csv',
+                                 'The communication matrix has to be a square.')
+
+    def test_zero_matrix(self):
+        self.assertRaisesMessage(ZeroDivisionError, '../bad_matrices/zero_matrix.csv',
+                                 'The communication matrix has rows with zeros only.')
+
+    def test_zero_row(self):
+        self.assertRaisesMessage(ZeroDivisionError, '../bad_matrices/zero_row.csv',
+                                 'The communication matrix has rows with zeros only.')
+
+    def test_dtype(self):
+        for dtype in (np.float16, np.int64):
+            with self.subTest(dtype=dtype):
+                self.assertRaisesMessage(ValueError, 'all_1s.csv',
+                                         'The data type has to be np.float64 or np.float32.',
+                                         dtype=dtype)
+
+class BadMatricesStreamTest(BadMatricesTest):
+    stream = True
+
+    def test_split_ks(self):
+        self.assertRaises(ValueError, CommunicationStatistics, 'all_1s.csv',
+                          stream=True, split_ks=[0])
+
+    def test_missing_k(self):
+        stats = CommunicationStatistics('all_1s.csv', stream=True, split_ks=[2, 4])
+        self.assertRaises(ValueError, stats.sp, 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Communication Statistics test with the matrices stored as np.float32
+"""
+
+import unittest
+import sys
+import numpy as np
+sys.path.insert(0, '..')
+from commstats import CommunicationStatistics
+
+class Float32Test(unittest.TestCase):
+    csv_files = ['all_1s.csv', '100_neighbor.csv']
+
+    def test_dtype(self):
+        for csv_file in self.csv_files:
+            with self.subTest(csv_file=csv_file):
+                costs = CommunicationStatistics(csv_file, dtype=np.float32).costs
+                self.assertEqual(costs.dtype, np.float32)
+                self.assertTrue(costs.flags['C_CONTIGUOUS'])
+
+    def test_stats(self):
+        for csv_file in self.csv_files:
+            stats = CommunicationStatistics(csv_file, dtype=np.float32)
+            reference = CommunicationStatistics(csv_file)
+            for name in ['ch', 'ch_v2', 'ca', 'cb', 'cb_v2', 'cc', 'nbc', 'sp']:
+                with self.subTest(csv_file=csv_file, stat=name):
+                    self.assertAlmostEqual(getattr(stats, name)(),
+                                           getattr(reference, name)(), places=4)
+
+if __name__ == '__main__':
+    unittest.main()
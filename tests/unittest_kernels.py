@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Communication Statistics test of the single-pass kernel against the NumPy implementation
+"""
+
+import unittest
+import sys
+from unittest import mock
+import numpy as np
+sys.path.insert(0, '..')
+import commstats
+from commstats import CommunicationStatistics
+
+@unittest.skipIf(commstats._fused_kernel is None, 'no compiled kernel available')
+class ReduceRowsTest(unittest.TestCase):
+    """Compares the compiled kernel with the NumPy implementation"""
+    csv_files = ['all_1s.csv', '100_neighbor.csv', '7x7_increasing.csv']
+
+    def check(self, rows, first):
+        fused = commstats._reduce_rows(rows, first, [2, 3, 4, 8])
+        with mock.patch.object(commstats, '_fused_kernel', None):
+            numpy = commstats._reduce_rows(rows, first, [2, 3, 4, 8])
+        np.testing.assert_allclose(fused.row_sums, numpy.row_sums)
+        np.testing.assert_allclose(fused.row_vars, numpy.row_vars)
+        self.assertAlmostEqual(fused.max_val, numpy.max_val)
+        self.assertAlmostEqual(fused.neighbor_sum, numpy.neighbor_sum)
+        self.assertEqual(fused.cc_sum, numpy.cc_sum)
+        self.assertEqual(sorted(fused.split_sums), sorted(numpy.split_sums))
+        for k in fused.split_sums:
+            self.assertAlmostEqual(fused.split_sums[k], numpy.split_sums[k])
+
+    def test_all_rows(self):
+        for csv_file in self.csv_files:
+            with self.subTest(csv_file=csv_file):
+                self.check(CommunicationStatistics(csv_file).costs, 0)
+
+    def test_some_rows(self):
+        for csv_file in self.csv_files:
+            with self.subTest(csv_file=csv_file):
+                self.check(CommunicationStatistics(csv_file).costs[3:6], 3)
+
+if __name__ == '__main__':
+    unittest.main()
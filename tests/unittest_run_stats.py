@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Communication Statistics test of the run_stats.py script
+"""
+
+import unittest
+import subprocess
+import sys
+
+class RunStatsTest(unittest.TestCase):
+    def run_stats(self, *args):
+        return subprocess.run([sys.executable, '../run_stats.py'] + list(args),
+                              stdout=subprocess.PIPE, universal_newlines=True,
+                              timeout=120, check=True).stdout
+
+    def test_parallel(self):
+        output = self.run_stats('-j', '2', 'all_1s.csv', '100_neighbor.csv')
+        self.assertEqual(output, self.run_stats('-j', '1', 'all_1s.csv', '100_neighbor.csv'))
+
+    def test_order(self):
+        files = ['100_neighbor.csv', 'all_1s.csv', '100_neighbor.csv']
+        output = self.run_stats('-j', '3', *files)
+        headers = [line for line in output.splitlines() if line.startswith('***')]
+        self.assertEqual(headers, ['*** Communication statistics for ' + name + ' ***'
+                                   for name in files])
+
+if __name__ == '__main__':
+    unittest.main()
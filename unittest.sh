@@ -4,3 +4,8 @@ set -x
 cd tests
 ./unittest_all_1s.py
 ./unittest_100_neighbor.py
+./unittest_7x7_increasing.py
+./unittest_dtype.py
+./unittest_kernels.py
+./unittest_bad_matrices.py
+./unittest_run_stats.py